@@ -1,9 +1,16 @@
+from datetime import timedelta
 from pathlib import Path
 
 MAIN_DOC_URL = 'https://docs.python.org/3/'
 PEP_URL = 'https://peps.python.org/'
 BASE_DIR = Path(__file__).parent
 DATETIME_FORMAT = '%Y-%m-%d_%H-%M-%S'
+# Кодировка страниц документации и PEP
+PAGE_ENCODING = 'utf-8'
+MAX_WORKERS = 50
+DOWNLOAD_CHUNK_SIZE = 2 ** 16
+CACHE_NAME = BASE_DIR / 'http_cache'
+CACHE_EXPIRE_AFTER = timedelta(days=1)
 
 EXPECTED_STATUS = {
     'A': ('Active', 'Accepted'),
@@ -1,16 +1,26 @@
 import logging
 import re
+import shutil
 from collections import Counter
 from urllib.parse import urljoin
 
 import requests_cache
-from bs4 import BeautifulSoup
-from tqdm import tqdm
+from lxml import html
+from requests.adapters import HTTPAdapter
 
 from configs import configure_argument_parser, configure_logging
-from constants import BASE_DIR, EXPECTED_STATUS, MAIN_DOC_URL, PEP_URL
+from constants import (BASE_DIR, CACHE_EXPIRE_AFTER, CACHE_NAME,
+                       DOWNLOAD_CHUNK_SIZE, EXPECTED_STATUS, MAIN_DOC_URL,
+                       MAX_WORKERS, PAGE_ENCODING, PEP_URL)
 from outputs import control_output
-from utils import find_tag, get_response
+from utils import (build_xpath, compile_xpath, extract_status, find_section,
+                   find_tag, get_response, get_responses, join_url,
+                   tag_not_found)
+
+VERSION_PATTERN = re.compile(
+    r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
+)
+HTML_PARSER = html.HTMLParser(recover=True, encoding=PAGE_ENCODING)
 
 
 def whats_new(session):
@@ -35,26 +45,34 @@ def whats_new(session):
     if response is None:
         return None
 
-    soup = BeautifulSoup(response.text, features='lxml')
-    main_div = find_tag(soup, 'section', attrs={'id': 'what-s-new-in-python'})
-    div_with_ul = find_tag(main_div, 'div', attrs={'class': 'toctree-wrapper'})
-    sections_by_python = div_with_ul.find_all(
-        'li', attrs={'class': 'toctree-l1'})
+    main_section = find_section(
+        response.content, 'section', {'id': 'what-s-new-in-python'}
+    )
+    div_with_ul = find_tag(
+        main_section, 'div', attrs={'class': 'toctree-wrapper'}
+    )
+    version_a_tags = compile_xpath(
+        build_xpath('li', {'class': 'toctree-l1'}) + '/a'
+    )(div_with_ul)
+
+    version_links = [
+        join_url(whats_new_url, version_a_tag.get('href'))
+        for version_a_tag in version_a_tags
+    ]
+    # Страницы версий загружаются параллельно, порядок ссылок сохраняется
+    responses = get_responses(session, version_links)
 
     results = [('Ссылка на статью', 'Заголовок', 'Редактор, Автор')]
-    for section in tqdm(sections_by_python):
-        version_a_tag = find_tag(section, 'a')
-        version_link = urljoin(whats_new_url, version_a_tag['href'])
-        response = get_response(session, version_link)
+    for version_link, response in zip(version_links, responses):
         if response is None:
             continue
 
-        soup = BeautifulSoup(response.text, 'lxml')
+        soup = html.fromstring(response.content, parser=HTML_PARSER)
         h1 = find_tag(soup, 'h1')
         dl = find_tag(soup, 'dl')
-        dl_text = dl.text.replace('\n', ' ')
+        dl_text = dl.text_content().replace('\n', ' ')
 
-        results.append((version_link, h1.text, dl_text))
+        results.append((version_link, h1.text_content(), dl_text))
 
     return results
 
@@ -77,35 +95,37 @@ def latest_versions(session):
               - Статус версии (str).
 
     Исключения:
-        Exception: Возникает, если не найдено
-                   содержание с ссылками на версии Python.
+        ParserFindTagException: Возникает, если не найдено
+                                содержание с ссылками на версии Python.
     """
     response = get_response(session, MAIN_DOC_URL)
     if response is None:
         return None
 
-    soup = BeautifulSoup(response.text, 'lxml')
-
-    sidebar = find_tag(soup, 'div', {'class': 'sphinxsidebarwrapper'})
-    ul_tags = sidebar.find_all('ul')
-
-    for ul in ul_tags:
-        if 'All versions' in ul.text:
-            a_tags = ul.find_all('a')
-            break
-    else:
-        raise Exception('Ничего не нашлось')
+    soup = html.fromstring(response.content, parser=HTML_PARSER)
+
+    # Ссылки из первого списка боковой панели, содержащего 'All versions'
+    sidebar_xpath = build_xpath(
+        'div', {'class': 'sphinxsidebarwrapper'}, axis='//'
+    )
+    a_tags_xpath = (
+        f"({sidebar_xpath}//ul[contains(., 'All versions')])[1]//a"
+    )
+    a_tags = compile_xpath(a_tags_xpath)(soup)
+    if not a_tags:
+        raise tag_not_found(
+            'a', error_msg=f'Не найдены ссылки на версии: {a_tags_xpath}'
+        )
 
     results = [('Ссылка на документацию', 'Версия', 'Статус')]
-    pattern = r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
     for a_tag in a_tags:
-        link = a_tag['href']
-        text_match = re.search(pattern, a_tag.text)
+        link = a_tag.get('href')
+        text_match = VERSION_PATTERN.search(a_tag.text_content())
         if text_match is not None:
             version = text_match.group('version')
             status = text_match.group('status')
         else:
-            version = a_tag.text
+            version = a_tag.text_content()
             status = ''
         results.append([link, version, status])
     return results
@@ -126,12 +146,19 @@ def download(session):
     if response is None:
         return None
 
-    soup = BeautifulSoup(response.text, 'lxml')
-    main_tag = find_tag(soup, 'div', {'role': 'main'})
+    main_tag = find_section(response.content, 'div', {'role': 'main'})
     table_tag = find_tag(main_tag, 'table', {'class': 'docutils'})
-    pdf_a4_tag = find_tag(
-        table_tag, 'a', {'href': re.compile(r'.+pdf-a4\.zip$')})
-    pdf_a4_link = pdf_a4_tag['href']
+    # XPath 1.0 не умеет ends-with, поэтому окончание ссылки
+    # сравнивается через substring
+    pdf_a4_xpath = (
+        ".//a/@href[substring(., string-length(.) - 9) = 'pdf-a4.zip']"
+    )
+    pdf_a4_links = compile_xpath(pdf_a4_xpath)(table_tag)
+    if not pdf_a4_links:
+        raise tag_not_found(
+            'a', error_msg=f'Не найдена ссылка на архив: {pdf_a4_xpath}'
+        )
+    pdf_a4_link = pdf_a4_links[0]
     archive_url = urljoin(downloads_url, pdf_a4_link)
     filename = archive_url.split('/')[-1]
 
@@ -139,13 +166,57 @@ def download(session):
     downloads_dir.mkdir(exist_ok=True)
     archive_path = downloads_dir / filename
 
-    response = session.get(archive_url)
-
-    with open(archive_path, 'wb') as file:
-        file.write(response.content)
+    # Архив не кэшируется и пишется на диск частями по мере загрузки
+    with session.cache_disabled():
+        with session.get(archive_url, stream=True) as response:
+            response.raw.decode_content = True
+            with open(archive_path, 'wb') as file:
+                shutil.copyfileobj(
+                    response.raw, file, length=DOWNLOAD_CHUNK_SIZE
+                )
     logging.info(f'Архив был загружен и сохранён: {archive_path}')
 
 
+def collect_pep_links(big_section):
+    """
+    Собирает ссылки на карточки PEP вместе с ожидаемыми статусами.
+    PEP, указанный в нескольких категориях, учитывается один раз.
+
+    Аргументы:
+        big_section (HtmlElement): Раздел страницы со списком
+                                   PEP по категориям.
+
+    Возвращает:
+        list: Список кортежей (ожидаемые статусы, полная ссылка на PEP)
+              с уникальными ссылками.
+    """
+    pep_links = []
+    # Используем множество для хранения уникальных значений href
+    # чтобы не загружать и не считать PEP повторно
+    cached_href = set()
+    for section in compile_xpath('.//section')(big_section):
+        # Находим таблицу, содержащую информацию о PEP
+        table = section.find('.//table')
+        if table is None:
+            continue
+
+        for row in compile_xpath('.//tr')(table):
+            href = compile_xpath('string(./td//a/@href)')(row)
+            # Строки без ссылки (например, заголовки таблиц) пропускаем
+            if not href or href in cached_href:
+                continue
+            abbr_texts = compile_xpath('./td[1]//abbr/text()')(row)
+            if not abbr_texts:
+                logging.info(
+                    f'Строка PEP со ссылкой "{href}" пропущена: '
+                    'не найдена аббревиатура статуса')
+                continue
+            cached_href.add(href)
+            section_status = EXPECTED_STATUS[abbr_texts[0][1:]]
+            pep_links.append((section_status, join_url(PEP_URL, href)))
+    return pep_links
+
+
 def pep(session):
     """
     Данная функция выполняет парсинг страницы PEP и считает
@@ -159,53 +230,37 @@ def pep(session):
         list: Список кортежей с результатами статистики. Каждый кортеж содержит
             статус PEP и соответствующее количество.
     """
-    pep_status_counter = Counter()
-    results = [('Статус', 'Количество')]
-
     response = get_response(session, PEP_URL)
     if response is None:
         return None
 
-    soup = BeautifulSoup(response.text, 'lxml')
-
-    # Находим основной раздел, содержащий все PEP
-    big_section = find_tag(soup, 'section', attrs={'id': 'index-by-category'})
-
-    sections = big_section.find_all('section')
+    # Разбираем страницу только до конца раздела, содержащего все PEP
+    big_section = find_section(
+        response.content, 'section', {'id': 'index-by-category'}
+    )
+    pep_links = collect_pep_links(big_section)
 
-    for section in tqdm(sections):
-        # Находим таблицу, содержащую информацию о PEP
-        table = section.table
-
-        # Используем множество для хранения уникальных значений href
-        # чтобы избежать обработки дубликатов
-        cached_href = set()
+    # Карточки загружаются параллельно, каждая ссылка - один раз
+    responses = get_responses(session, [href for _, href in pep_links])
 
-        if not table:
+    found_statuses = []
+    for (section_status, full_href), response in zip(pep_links, responses):
+        if response is None:
             continue
-
-        for td in tqdm(table.find_all('td')):
-            if td.abbr:
-                section_status = td.abbr.text[1:]
-                section_status = EXPECTED_STATUS[section_status]
-            if td.a and td.a['href'] not in cached_href:
-                href = td.a['href']
-                cached_href.add(href)
-                full_href = urljoin(PEP_URL, href)
-                response = get_response(session, full_href)
-                soup = BeautifulSoup(response.text, 'lxml')
-                table_text = find_tag(soup, 'dl').text
-                page_status = table_text.split('Status:')[-1].split()[0]
-                if page_status in section_status:
-                    pep_status_counter[section_status] += 1
-                else:
-                    logging.info(
-                        f'Статус в карточке "{full_href}" отображен как '
-                        f'"{page_status}", что не соотносится '
-                        f'с {section_status}')
-        cached_href.clear()
-    results.extend((', '.join(k), v) for k, v in pep_status_counter.items())
-    return results
+        page_status = extract_status(response.content)
+        if page_status in section_status:
+            found_statuses.append(section_status)
+        else:
+            logging.info(
+                f'Статус в карточке "{full_href}" отображен как '
+                f'"{page_status}", что не соотносится '
+                f'с {section_status}')
+    pep_status_counter = Counter(found_statuses)
+    return [
+        ('Статус', 'Количество'),
+        *((', '.join(status), count)
+          for status, count in pep_status_counter.most_common()),
+    ]
 
 
 MODE_TO_FUNCTION = {
@@ -227,7 +282,21 @@ def main():
     args = arg_parser.parse_args()
     logging.info(f'Аргументы командной строки: {args}')
 
-    session = requests_cache.CachedSession()
+    # Кэш хранится в SQLite между запусками и учитывает заголовки
+    # Cache-Control/ETag, поэтому повторные запросы становятся условными
+    session = requests_cache.CachedSession(
+        cache_name=str(CACHE_NAME),
+        backend='sqlite',
+        expire_after=CACHE_EXPIRE_AFTER,
+        cache_control=True,
+        stale_if_error=True,
+        allowable_methods=('GET',),
+    )
+    # Пул keep-alive соединений на каждый хост рассчитан на все потоки
+    # загрузки, иначе лишние соединения закрываются после каждого запроса
+    adapter = HTTPAdapter(pool_maxsize=MAX_WORKERS)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
     if args.clear_cache:
         session.cache.clear()
 
@@ -1,7 +1,14 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from io import BytesIO
+from urllib.parse import urljoin
 
+from lxml import etree, html
 from requests import RequestException
+from tqdm import tqdm
 
+from constants import MAX_WORKERS, PAGE_ENCODING
 from exceptions import ParserFindTagException
 
 
@@ -26,7 +33,7 @@ def get_response(session, url):
     """
     try:
         response = session.get(url)
-        response.encoding = 'utf-8'
+        response.encoding = PAGE_ENCODING
         return response
     except RequestException:
         logging.exception(
@@ -35,30 +42,218 @@ def get_response(session, url):
         )
 
 
+def get_responses(session, urls, max_workers=MAX_WORKERS):
+    """
+    Параллельно выполняет GET-запросы по списку URL в пуле потоков.
+
+    Аргументы:
+        session: Объект CachedSession из библиотеки requests_cache,
+                 который используется для кэширования запросов.
+        urls (list): Список URL для выполнения GET-запросов.
+        max_workers (int, optional): Максимальное количество
+                                     одновременных запросов.
+
+    Возвращает:
+        list: Список объектов Response (или None для неудачных запросов)
+              в том же порядке, что и urls.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Один общий индикатор на все загрузки; перерисовывается
+        # не чаще раза в полсекунды и не чаще раза в 10 загрузок
+        return list(tqdm(
+            executor.map(partial(get_response, session), urls),
+            total=len(urls),
+            miniters=10,
+            mininterval=0.5,
+        ))
+
+
+def join_url(base, href):
+    """
+    Присоединяет ссылку к базовому URL. Простые относительные ссылки
+    (например, 'pep-0001/') без точечных и пустых сегментов, пробелов и
+    управляющих символов к базе, оканчивающейся на '/', склеиваются
+    строкой, остальные разбираются через urljoin.
+
+    Аргументы:
+        base (str): Базовый URL.
+        href (str): Ссылка из атрибута href.
+
+    Возвращает:
+        str: Полный URL.
+    """
+    if (
+        base.endswith('/')
+        and ':' not in href
+        and '/.' not in href
+        and '//' not in href
+        and not href.startswith(('/', '.', '#', '?'))
+        # urljoin отбрасывает пробелы и управляющие символы
+        and all(char > ' ' for char in href)
+    ):
+        return base + href
+    return urljoin(base, href)
+
+
+@lru_cache(maxsize=None)
+def compile_xpath(expression):
+    """
+    Компилирует XPath-выражение и кэширует результат, чтобы
+    повторные поиски не разбирали выражение заново.
+
+    Аргументы:
+        expression (str): XPath-выражение.
+
+    Возвращает:
+        XPath: Скомпилированное выражение lxml, которое
+               вызывается с элементом в качестве аргумента.
+    """
+    return etree.XPath(expression)
+
+
+def build_xpath(tag, attrs=None, axis='.//'):
+    """
+    Строит XPath-выражение для поиска тега среди потомков элемента.
+
+    Аргументы:
+        tag (str): Имя тега.
+        attrs (dict, optional): Атрибуты тега. Значение атрибута class
+                                сравнивается с каждым из классов тега,
+                                остальные - на равенство.
+        axis (str, optional): Ось поиска (по умолчанию все потомки,
+                              'self::' - проверка самого элемента).
+
+    Возвращает:
+        str: XPath-выражение.
+    """
+    conditions = []
+    for name, value in (attrs or {}).items():
+        if name == 'class':
+            conditions.append(
+                "contains(concat(' ', normalize-space(@class), ' '), "
+                f"' {value} ')"
+            )
+        else:
+            conditions.append(f"@{name}='{value}'")
+    predicates = ''.join(f'[{condition}]' for condition in conditions)
+    return f'{axis}{tag}{predicates}'
+
+
 # Перехват ошибки поиска тегов.
-def find_tag(soup, tag, attrs=None):
+def find_tag(root, tag, attrs=None):
     """
-    Выполняет поиск тега в объекте BeautifulSoup и обрабатывает
+    Выполняет поиск тега в дереве lxml с помощью XPath и обрабатывает
     ошибку ParserFindTagException.
 
     Аргументы:
-        soup (BeautifulSoup): Объект BeautifulSoup, представляющий
-                              HTML-код страницы.
+        root (HtmlElement): Элемент lxml, среди потомков
+                            которого выполняется поиск.
         tag (str): Имя тега, который необходимо найти.
         attrs (dict, optional): Атрибуты тега (словарь), по которым
                                 выполняется поиск (по умолчанию None).
 
     Возвращает:
-        Tag: Объект Tag из библиотеки BeautifulSoup, соответствующий
-             найденному тегу.
+        HtmlElement: Первый найденный элемент lxml.
 
     Исключения:
         ParserFindTagException: Возникает, если указанный тег не
-                                найден в объекте BeautifulSoup.
-    """
-    searched_tag = soup.find(tag, attrs=(attrs or {}))
-    if searched_tag is None:
-        error_msg = f'Не найден тег {tag} {attrs}'
-        logging.error(error_msg, stack_info=True)
-        raise ParserFindTagException(error_msg)
-    return searched_tag
+                                найден среди потомков элемента.
+    """
+    searched_tags = compile_xpath(build_xpath(tag, attrs))(root)
+    if not searched_tags:
+        raise tag_not_found(tag, attrs)
+    return searched_tags[0]
+
+
+def find_section(content, tag, attrs=None):
+    """
+    Потоково разбирает HTML-код только до конца первого тега с
+    указанными атрибутами, не строя дерево оставшейся части страницы.
+
+    Аргументы:
+        content (bytes): HTML-код страницы.
+        tag (str): Имя тега, который необходимо найти.
+        attrs (dict, optional): Атрибуты тега (словарь), по которым
+                                выполняется поиск (по умолчанию None).
+
+    Возвращает:
+        HtmlElement: Найденный элемент lxml с полностью
+                     разобранным содержимым.
+
+    Исключения:
+        ParserFindTagException: Возникает, если указанный тег не
+                                найден на странице.
+    """
+    matches = compile_xpath(build_xpath(tag, attrs, axis='self::'))
+    context = etree.iterparse(
+        BytesIO(content), events=('end',), tag=tag,
+        html=True, encoding=PAGE_ENCODING
+    )
+    # Те же классы элементов, что и у html.fromstring (с text_content)
+    context.set_element_class_lookup(html.HtmlElementClassLookup())
+    try:
+        for _, element in context:
+            if matches(element):
+                return element
+    except etree.XMLSyntaxError:
+        logging.exception('Не удалось разобрать страницу')
+    raise tag_not_found(tag, attrs)
+
+
+def tag_not_found(tag, attrs=None, error_msg=None):
+    """
+    Записывает в журнал ошибку поиска тега и возвращает исключение.
+
+    Аргументы:
+        tag (str): Имя ненайденного тега.
+        attrs (dict, optional): Атрибуты ненайденного тега.
+        error_msg (str, optional): Текст ошибки (по умолчанию
+                                   составляется из имени и атрибутов).
+
+    Возвращает:
+        ParserFindTagException: Исключение с описанием ошибки.
+    """
+    error_msg = error_msg or f'Не найден тег {tag} {attrs}'
+    logging.error(error_msg, stack_info=True)
+    return ParserFindTagException(error_msg)
+
+
+def parse_status(text):
+    """
+    Возвращает первое слово после последней метки "Status:" в тексте.
+
+    Аргументы:
+        text (str): Текст списка полей карточки PEP.
+
+    Возвращает:
+        str: Статус PEP или None, если после метки нет текста.
+    """
+    _, _, tail = text.rpartition('Status:')
+    words = tail.split(maxsplit=1)
+    return words[0] if words else None
+
+
+def extract_status(content):
+    """
+    Извлекает статус PEP из HTML-кода карточки, потоково разбирая
+    страницу до первого списка <dl> с полем "Status:".
+
+    Аргументы:
+        content (bytes): HTML-код карточки PEP.
+
+    Возвращает:
+        str: Статус PEP или None, если поле статуса не найдено.
+    """
+    context = etree.iterparse(
+        BytesIO(content), events=('end',), tag='dl',
+        html=True, encoding=PAGE_ENCODING
+    )
+    try:
+        for _, dl in context:
+            dl_text = ''.join(dl.itertext())
+            dl.clear()
+            if 'Status:' in dl_text:
+                return parse_status(dl_text)
+    except etree.XMLSyntaxError:
+        logging.exception('Не удалось разобрать карточку PEP')
+    return None
@@ -1,7 +1,7 @@
 import pytest
 import sys
 from pathlib import Path
-from bs4 import BeautifulSoup
+from lxml import html
 import requests_mock
 from argparse import Namespace
 from typing import List, Tuple
@@ -84,7 +84,7 @@ def response_page(mock_session):
 @pytest.fixture
 def soup(response_page):
     response = response_page(MAIN_DOC_URL + '/whatsnew')
-    return BeautifulSoup(response, features='lxml')
+    return html.fromstring(response)
 
 
 @pytest.fixture
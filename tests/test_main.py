@@ -1,7 +1,7 @@
 import pytest
 from pathlib import Path
 try:
-    from src import main
+    from src import main, utils
 except ModuleNotFoundError:
     assert False, 'Убедитесь что в директории `src` есть файл `main.py`'
 except ImportError:
@@ -140,3 +140,34 @@ def test_mode_to_function():
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+def test_collect_pep_links():
+    content = (
+        '<html><body><section id="index-by-category">'
+        '<section id="process"><table>'
+        '<thead><tr><th>Type</th><th>PEP</th></tr></thead><tbody>'
+        '<tr><td><p><abbr>PA</abbr></p></td>'
+        '<td><a href="pep-0001/">1</a></td></tr>'
+        '<tr><td><abbr>SF</abbr></td><td><a href="pep-0008/">8</a></td></tr>'
+        '<tr><td><abbr>S</abbr></td><td><a href="pep-0010/">10</a></td></tr>'
+        '<tr><td></td><td><a href="pep-0011/">11</a></td></tr>'
+        '</tbody></table></section>'
+        '<section id="other"><table><tbody>'
+        '<tr><td><abbr>IR</abbr></td><td><a href="pep-0008/">8</a></td></tr>'
+        '</tbody></table></section>'
+        '</section></body></html>'
+    ).encode()
+    big_section = utils.find_section(
+        content, 'section', {'id': 'index-by-category'}
+    )
+    got = main.collect_pep_links(big_section)
+    assert got == [
+        (('Active', 'Accepted'), 'https://peps.python.org/pep-0001/'),
+        (('Final',), 'https://peps.python.org/pep-0008/'),
+        (('Draft', 'Active'), 'https://peps.python.org/pep-0010/'),
+    ], (
+        'Функция `collect_pep_links` модуля `main.py` должна учитывать '
+        'каждый PEP один раз со статусом первой категории и пропускать '
+        'строки без ссылки или аббревиатуры статуса'
+    )
@@ -1,7 +1,8 @@
 import pytest
 import requests
 import requests_mock
-import bs4
+from urllib.parse import urljoin
+from lxml import etree, html
 from conftest import MAIN_DOC_URL
 try:
     from src import utils
@@ -13,11 +14,12 @@ except ImportError:
 
 def test_find_tag(soup):
     got = utils.find_tag(soup, 'section', attrs={'id': 'what-s-new-in-python'})
-    assert isinstance(got, bs4.element.Tag), (
+    assert isinstance(got, html.HtmlElement), (
         'Функция `find_tag` в модуле `utils.py` должна возвращать искомый тег'
     )
     assert (
-        '<section id="what-s-new-in-python">' in got.__str__()
+        '<section id="what-s-new-in-python">'
+        in etree.tostring(got, encoding='unicode')
     ), (
         'Функция `find_tag` модуля `utils.py` '
         'не вернула ожидаемый <section> с `id=what-s-new-in-python`'
@@ -54,3 +56,100 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+def test_get_responses(mock_session):
+    adapter = mock_session.mock_adapter
+    adapter.register_uri('GET', 'mock://first', text='first')
+    adapter.register_uri('GET', 'mock://second', text='second')
+    adapter.register_uri(
+        'GET', 'mock://broken', exc=requests.exceptions.ConnectionError
+    )
+    got = utils.get_responses(
+        mock_session, ['mock://second', 'mock://broken', 'mock://first']
+    )
+    assert [
+        response.text if response is not None else None
+        for response in got
+    ] == ['second', None, 'first'], (
+        'Функция `get_responses` модуля `utils.py` должна возвращать '
+        'ответы в порядке переданных URL и `None` на месте '
+        'запросов, завершившихся `RequestException`'
+    )
+
+def test_extract_status():
+    content = (
+        '<html><body><dl class="rfc2822 field-list simple">'
+        '<dt>Author<span class="colon">:</span></dt><dd>Guido</dd>'
+        '<dt>Status<span class="colon">:</span></dt>'
+        '<dd><abbr title="Accepted and implementation complete">Final</abbr>'
+        '</dd></dl></body></html>'
+    ).encode()
+    got = utils.extract_status(content)
+    assert got == 'Final', (
+        'Функция `extract_status` модуля `utils.py` должна '
+        'возвращать статус из карточки PEP'
+    )
+    assert utils.extract_status(b'<html><body></body></html>') is None, (
+        'Функция `extract_status` модуля `utils.py` должна '
+        'возвращать `None`, если статус в карточке не найден'
+    )
+
+
+def test_parse_status():
+    got = utils.parse_status('Author: Guido Status: Final Type: Process')
+    assert got == 'Final', (
+        'Функция `parse_status` модуля `utils.py` должна возвращать '
+        'первое слово после метки `Status:`'
+    )
+    assert utils.parse_status('Status:   ') is None, (
+        'Функция `parse_status` модуля `utils.py` должна '
+        'возвращать `None`, если после метки `Status:` нет текста'
+    )
+
+
+def test_find_section():
+    content = (
+        '<html><body><section id="index-by-category"><p>PEP</p></section>'
+        '<section id="numerical-index"></section></body></html>'
+    ).encode()
+    got = utils.find_section(
+        content, 'section', {'id': 'index-by-category'}
+    )
+    assert isinstance(got, html.HtmlElement), (
+        'Функция `find_section` в модуле `utils.py` должна возвращать '
+        'элемент `lxml.html.HtmlElement`'
+    )
+    assert got.get('id') == 'index-by-category', (
+        'Функция `find_section` модуля `utils.py` должна '
+        'возвращать искомый тег'
+    )
+    with pytest.raises(BaseException) as excinfo:
+        utils.find_section(content, 'section', {'id': 'unexpected'})
+    assert excinfo.typename == 'ParserFindTagException', (
+        'Функция `find_section` в модуле `utils.py` в случае '
+        'отсутствия искомого тэга '
+        'должна выбросить нестандартное исключение `ParserFindTagException`'
+    )
+
+
+@pytest.mark.parametrize('href', [
+    'pep-0001/',
+    '3.12.html',
+    '/pep-0008/',
+    '../2/whatsnew/',
+    '#index',
+    'a/../b',
+    'a//b',
+    ' pep-0001/',
+    'pep-0001/\n',
+    'pep\t-0001/',
+    'pep 0001/',
+    'https://docs.python.org/3.12/',
+])
+def test_join_url(href):
+    base = 'https://peps.python.org/'
+    assert utils.join_url(base, href) == urljoin(base, href), (
+        'Функция `join_url` модуля `utils.py` должна возвращать '
+        'тот же URL, что и `urljoin`'
+    )